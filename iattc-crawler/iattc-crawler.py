@@ -8,22 +8,57 @@ Author: Alejandro Perez
 """
 
 import os
-import json
+import io
+import sys
+import mmap
+import asyncio
 import csv
+import codecs
 import zipfile
 import hashlib
 import logging
-import requests
-import schedule
+import aiofiles
+import aiohttp
+import orjson
+import signal
 import time
+import shutil
+import tempfile
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable, Iterable, Iterator, BinaryIO, Mapping, Union
 from pathlib import Path
 from dataclasses import dataclass
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:  # Optional: native CSV parsing fast path
+    pa = None
+
+try:
+    import blake3
+except ImportError:  # Optional: SIMD-accelerated hashing
+    blake3 = None
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # Optional: C HTML parser for link extraction
+    lxml_html = None
+
+try:
+    import fast_clean
+except ImportError:  # Optional: compiled row cleaner, build with `cythonize -i fast_clean.pyx`
+    fast_clean = None
+
+
+def create_hasher(data: bytes = b'') -> Any:
+    """Create a BLAKE3 hasher when available, otherwise MD5; both expose update/hexdigest/name"""
+    return blake3.blake3(data) if blake3 is not None else hashlib.md5(data)
 
 
 # =============================================================================
@@ -40,9 +75,11 @@ class Config:
     cache_file: str = "./site_cache.json"
     check_interval_minutes: int = 60
     max_workers: int = 4
+    max_concurrent_requests: int = 32
     user_agent: str = "IATTC-Data-Monitor/1.0"
     request_timeout: int = 30
     retry_attempts: int = 3
+    csv_delimiter: Optional[str] = None  # None sniffs the first CSV of each archive
 
 
 @dataclass
@@ -52,7 +89,19 @@ class FileInfo:
     filename: str
     size: Optional[int] = None
     last_modified: Optional[str] = None
+    etag: Optional[str] = None
     checksum: Optional[str] = None
+    accept_ranges: bool = False
+
+
+@dataclass
+class DownloadProgress:
+    """Byte counter shared by all ranges of a single download"""
+    filename: str
+    total: int
+    downloaded: int = 0
+    next_log: int = sys.maxsize
+    hasher: Optional[Any] = None  # Only set for sequential downloads, ranges arrive out of order
 
 
 # =============================================================================
@@ -63,11 +112,16 @@ class IWebsiteMonitor(ABC):
     """Interface for website monitoring strategies"""
     
     @abstractmethod
-    def detect_changes(self, url: str) -> bool:
+    async def detect_changes(self, session: aiohttp.ClientSession, url: str) -> bool:
         pass
     
     @abstractmethod
-    def get_zip_files(self, url: str) -> List[FileInfo]:
+    async def get_zip_files(self, session: aiohttp.ClientSession, url: str) -> List[FileInfo]:
+        pass
+    
+    @abstractmethod
+    def commit_changes(self) -> None:
+        """Remember the page version seen by detect_changes, once every file it links has been handled"""
         pass
 
 
@@ -75,12 +129,12 @@ class IFileDownloader(ABC):
     """Interface for file downloading strategies"""
     
     @abstractmethod
-    def download(self, file_info: FileInfo, destination: Path) -> bool:
+    async def download(self, session: aiohttp.ClientSession, file_info: FileInfo, destination: Path) -> bool:
         pass
 
 
 class IFileProcessor(ABC):
-    """Interface for file processing strategies"""
+    """Interface for file processing strategies (failures raise, so the monitor can retry the download)"""
     
     @abstractmethod
     def can_process(self, file_path: Path) -> bool:
@@ -91,6 +145,42 @@ class IFileProcessor(ABC):
         pass
 
 
+class IStreamProcessor(ABC):
+    """Interface for processors that consume a file straight from an open binary stream"""
+    
+    @abstractmethod
+    def can_process(self, file_path: Path) -> bool:
+        pass
+    
+    @abstractmethod
+    def process_stream(self, stream: BinaryIO, name: str, output_dir: Path) -> List[Path]:
+        pass
+    
+    def begin_archive(self, archive_path: Path) -> None:
+        """Called before the members of an archive are streamed, state from earlier archives can be dropped"""
+        pass
+
+
+class ICacheStore(ABC):
+    """Interface for persisting monitor state between cycles"""
+    
+    @abstractmethod
+    def load(self) -> Dict[str, Any]:
+        pass
+    
+    @abstractmethod
+    def save(self, data: Dict[str, Any]) -> None:
+        pass
+    
+    @abstractmethod
+    def get_file_entry(self, url: str) -> Dict[str, Any]:
+        pass
+    
+    @abstractmethod
+    def update_file_entry(self, url: str, **values: Any) -> None:
+        pass
+
+
 class INotificationService(ABC):
     """Interface for notification strategies"""
     
@@ -103,36 +193,97 @@ class INotificationService(ABC):
 # CONCRETE IMPLEMENTATIONS
 # =============================================================================
 
+class JsonFileCache(ICacheStore):
+    """JSON file cache holding page validators and per-file entries keyed by URL"""
+    
+    def __init__(self, config: Config):
+        self.cache_file = Path(config.cache_file)
+        self.logger = logging.getLogger(__name__)
+    
+    def load(self) -> Dict[str, Any]:
+        """Load cache from file"""
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'rb') as f:
+                    return orjson.loads(f.read())
+            except Exception as e:
+                self.logger.warning(f"Could not load cache: {e}")
+        return {}
+    
+    def save(self, data: Dict[str, Any]) -> None:
+        """Save cache to file atomically (write a temp file, then rename over the old one)"""
+        tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            self.logger.error(f"Could not save cache: {e}")
+    
+    def get_file_entry(self, url: str) -> Dict[str, Any]:
+        """Get the cached entry for a file URL"""
+        return self.load().get('files', {}).get(url, {})
+    
+    def update_file_entry(self, url: str, **values: Any) -> None:
+        """Merge values into the cached entry for a file URL"""
+        data = self.load()
+        data.setdefault('files', {}).setdefault(url, {}).update(values)
+        self.save(data)
+
+
 class WebsiteMonitor(IWebsiteMonitor):
     """Concrete implementation of website monitoring"""
     
-    def __init__(self, config: Config):
+    PAGE_HEADERS = {'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'}
+    ZIP_HREF_RE = re.compile(r'href=["\']([^"\']*\.zip)["\']', re.IGNORECASE)
+    
+    def __init__(self, config: Config, cache: ICacheStore):
         self.config = config
-        self.session = self._create_session()
-        self.cache_file = Path(config.cache_file)
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
+        self._pending_page: Optional[Dict[str, Any]] = None
     
-    def _create_session(self) -> requests.Session:
-        """Create configured HTTP session"""
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': self.config.user_agent,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
-        })
-        return session
-    
-    def detect_changes(self, url: str) -> bool:
-        """Detect if website has changed since last check"""
+    async def detect_changes(self, session: aiohttp.ClientSession, url: str) -> bool:
+        """Detect if website has changed since last check using a conditional GET"""
         try:
-            response = self._make_request(url)
-            if not response:
+            cache = self.cache.load()
+            headers = {
+                header: value for header, value in (
+                    ('If-None-Match', cache.get('etag')),
+                    ('If-Modified-Since', cache.get('last_modified'))
+                ) if value
+            }
+            
+            result = await self._make_request(session, url, headers=headers)
+            if not result:
                 return False
             
-            current_hash = hashlib.md5(response.content).hexdigest()
-            previous_hash = self._load_cache().get('page_hash')
+            response, body = result
             
-            if current_hash != previous_hash:
-                self._save_cache({'page_hash': current_hash, 'last_check': datetime.now().isoformat()})
+            # 304 Not Modified carries no body, nothing else to compare
+            if response.status == 304:
+                return False
+            
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            
+            # Only hash the body for servers that send no validators
+            if etag or last_modified:
+                current_hash = None
+                changed = (etag, last_modified) != (cache.get('etag'), cache.get('last_modified'))
+            else:
+                hasher = create_hasher(body)
+                current_hash = f"{hasher.name}:{hasher.hexdigest()}"
+                changed = current_hash != cache.get('page_hash')
+            
+            # Saved by commit_changes, so a cycle that fails part way sees the page as changed again
+            if changed:
+                self._pending_page = {
+                    'page_hash': current_hash,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'last_check': datetime.now().isoformat()
+                }
                 return True
             
             return False
@@ -141,28 +292,38 @@ class WebsiteMonitor(IWebsiteMonitor):
             self.logger.error(f"Error detecting changes: {e}")
             return False
     
-    def get_zip_files(self, url: str) -> List[FileInfo]:
+    async def get_zip_files(self, session: aiohttp.ClientSession, url: str) -> List[FileInfo]:
         """Extract zip file information from website"""
         try:
-            response = self._make_request(url)
-            if not response:
+            result = await self._make_request(session, url)
+            if not result:
                 return []
             
+            response, body = result
+            
             zip_files = []
-            zip_pattern = re.compile(r'href=["\']([^"\']*\.zip)["\']', re.IGNORECASE)
             
-            for match in zip_pattern.finditer(response.text):
-                file_url = urljoin(url, match.group(1))
+            for href in self._extract_zip_hrefs(body, response.charset):
+                file_url = urljoin(url, href)
                 filename = os.path.basename(urlparse(file_url).path)
                 
-                file_info = FileInfo(
+                zip_files.append(FileInfo(
                     url=file_url,
                     filename=filename
-                )
-                
-                # Get additional file metadata
-                self._enrich_file_info(file_info)
-                zip_files.append(file_info)
+                ))
+            
+            # HEAD metadata is only reused for the same version of the page (a cycle resumed after a failure),
+            # any page change re-checks every file since ZIPs can be republished under the same URL
+            page_version = self._page_version(response, body)
+            cached_files = self.cache.load().get('files', {})
+            stale_files = [
+                file_info for file_info in zip_files
+                if not self._apply_cached_metadata(file_info, cached_files.get(file_info.url, {}), page_version)
+            ]
+            
+            # Get additional file metadata
+            await self._enrich_all(session, stale_files)
+            self._store_metadata(stale_files, page_version)
             
             self.logger.info(f"Found {len(zip_files)} zip files")
             return zip_files
@@ -171,103 +332,318 @@ class WebsiteMonitor(IWebsiteMonitor):
             self.logger.error(f"Error getting zip files: {e}")
             return []
     
-    def _make_request(self, url: str) -> Optional[requests.Response]:
-        """Make HTTP request with retry logic"""
+    def commit_changes(self) -> None:
+        """Save the validators of the page version detect_changes reported"""
+        if self._pending_page is None:
+            return
+        
+        data = self.cache.load()
+        data.update(self._pending_page)
+        self.cache.save(data)
+        self._pending_page = None
+    
+    def _extract_zip_hrefs(self, body: bytes, charset: Optional[str]) -> List[str]:
+        """Extract .zip link targets, parsing the raw bytes with lxml when installed"""
+        if lxml_html is not None and body.strip():
+            hrefs = lxml_html.fromstring(body).xpath('//@href')
+            return [href.strip() for href in hrefs if href.strip().lower().endswith('.zip')]
+        
+        text = body.decode(charset or 'utf-8', errors='replace')
+        return [match.group(1) for match in self.ZIP_HREF_RE.finditer(text)]
+    
+    async def _make_request(self,
+                            session: aiohttp.ClientSession,
+                            url: str,
+                            headers: Optional[Dict[str, str]] = None) -> Optional[Tuple[aiohttp.ClientResponse, bytes]]:
+        """Make HTTP request with retry logic, returns the response and its body"""
         for attempt in range(self.config.retry_attempts):
             try:
-                response = self.session.get(url, timeout=self.config.request_timeout)
-                response.raise_for_status()
-                return response
-            except requests.RequestException as e:
+                async with session.get(url, headers={**self.PAGE_HEADERS, **(headers or {})}) as response:
+                    response.raise_for_status()
+                    return response, await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 self.logger.warning(f"Request attempt {attempt + 1} failed: {e}")
                 if attempt == self.config.retry_attempts - 1:
                     self.logger.error(f"All request attempts failed for {url}")
-                time.sleep(2 ** attempt)  # Exponential backoff
+                await asyncio.sleep(2 ** attempt)  # Exponential backoff
         return None
     
-    def _enrich_file_info(self, file_info: FileInfo) -> None:
-        """Get additional metadata for file"""
-        try:
-            response = self.session.head(file_info.url, timeout=self.config.request_timeout)
-            file_info.size = int(response.headers.get('content-length', 0))
-            file_info.last_modified = response.headers.get('last-modified')
-        except Exception as e:
-            self.logger.warning(f"Could not get metadata for {file_info.filename}: {e}")
+    @staticmethod
+    def _page_version(response: aiohttp.ClientResponse, body: bytes) -> str:
+        """Identify a version of the page by its validators, or by a body hash when the server sends none"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            return f"{etag}|{last_modified}"
+        
+        hasher = create_hasher(body)
+        return f"{hasher.name}:{hasher.hexdigest()}"
     
-    def _load_cache(self) -> Dict[str, Any]:
-        """Load cache from file"""
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                self.logger.warning(f"Could not load cache: {e}")
-        return {}
+    def _apply_cached_metadata(self, file_info: FileInfo, entry: Dict[str, Any], page_version: str) -> bool:
+        """Fill file_info from metadata cached for the same page version, returns False when a HEAD is needed"""
+        metadata = entry.get('metadata', {})
+        if metadata.get('page') != page_version or metadata.get('size') is None or not metadata.get('last_modified'):
+            return False
+        
+        file_info.size = metadata['size']
+        file_info.last_modified = metadata['last_modified']
+        file_info.etag = metadata.get('etag')
+        file_info.accept_ranges = metadata.get('accept_ranges', False)
+        return True
+    
+    def _store_metadata(self, infos: List[FileInfo], page_version: str) -> None:
+        """Cache HEAD metadata per file URL, replacing entries from earlier page versions in one save"""
+        enriched = [file_info for file_info in infos if file_info.size is not None]
+        if not enriched:
+            return
+        
+        data = self.cache.load()
+        files = data.setdefault('files', {})
+        
+        for file_info in enriched:
+            entry = files.setdefault(file_info.url, {})
+            previous_etag = entry.get('metadata', {}).get('etag')
+            if previous_etag and previous_etag != file_info.etag:
+                self.logger.info(f"{file_info.filename} changed on the server (ETag mismatch), re-processing it")
+                entry.pop('processed', None)
+            
+            entry['metadata'] = {
+                'page': page_version,
+                'size': file_info.size,
+                'last_modified': file_info.last_modified,
+                'etag': file_info.etag,
+                'accept_ranges': file_info.accept_ranges
+            }
+        
+        self.cache.save(data)
+    
+    async def _enrich_all(self, session: aiohttp.ClientSession, infos: List[FileInfo]) -> None:
+        """Get additional metadata for all files with concurrent HEAD requests"""
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+        await asyncio.gather(*(
+            self._enrich_file_info(session, semaphore, file_info) for file_info in infos
+        ))
     
-    def _save_cache(self, data: Dict[str, Any]) -> None:
-        """Save cache to file"""
+    async def _enrich_file_info(self,
+                                session: aiohttp.ClientSession,
+                                semaphore: asyncio.Semaphore,
+                                file_info: FileInfo) -> None:
+        """Get additional metadata for file"""
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            async with semaphore, session.head(file_info.url) as response:
+                file_info.size = int(response.headers.get('content-length', 0))
+                file_info.last_modified = response.headers.get('last-modified')
+                file_info.etag = response.headers.get('etag')
+                file_info.accept_ranges = response.headers.get('accept-ranges', '').lower() == 'bytes'
         except Exception as e:
-            self.logger.error(f"Could not save cache: {e}")
+            self.logger.warning(f"Could not get metadata for {file_info.filename}: {e}")
 
 
 class FileDownloader(IFileDownloader):
     """Concrete implementation of file downloading"""
     
-    def __init__(self, config: Config):
+    CHUNK_SIZE = 1 << 20
+    PROGRESS_MIN_SIZE = 100 << 20
+    RANGE_PART_SIZE = 8 << 20
+    MAX_RANGE_PARTS = 8
+    
+    def __init__(self, config: Config, cache: ICacheStore):
         self.config = config
-        self.session = self._create_session()
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
     
-    def _create_session(self) -> requests.Session:
-        """Create configured HTTP session for downloads"""
-        session = requests.Session()
-        session.headers.update({'User-Agent': self.config.user_agent})
-        return session
-    
-    def download(self, file_info: FileInfo, destination: Path) -> bool:
-        """Download file with progress tracking and validation"""
+    async def download(self, session: aiohttp.ClientSession, file_info: FileInfo, destination: Path) -> bool:
+        """Download file with progress tracking and validation, skipping bodies the server reports unchanged"""
+        part_path = destination.with_name(destination.name + '.part')
+        
         try:
             destination.parent.mkdir(parents=True, exist_ok=True)
             
-            # Skip if file already exists and is valid
+            # Revalidate an existing file with its stored validators, or fall back to the size check
+            headers = {}
             if destination.exists() and self._validate_existing_file(destination, file_info):
-                self.logger.info(f"File {file_info.filename} already exists and is valid")
-                return True
+                cached = self.cache.get_file_entry(file_info.url)
+                headers = {
+                    header: value for header, value in (
+                        ('If-None-Match', cached.get('etag')),
+                        ('If-Modified-Since', cached.get('last_modified'))
+                    ) if value
+                }
+                if not headers:
+                    self.logger.info(f"File {file_info.filename} already exists and is valid")
+                    return True
             
-            self.logger.info(f"Downloading {file_info.filename}...")
-            
-            response = self.session.get(
-                file_info.url, 
-                stream=True, 
-                timeout=self.config.request_timeout
-            )
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded_size = 0
+            started = time.monotonic()
+            result = await self._fetch(session, file_info, part_path, headers)
+            if result is None:
+                self.logger.info(f"File {file_info.filename} is already current")
+                return True
             
-            with open(destination, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        self._log_progress(downloaded_size, total_size, file_info.filename)
+            response_headers, progress = result
+            if progress.hasher is not None:
+                file_info.checksum = f"{progress.hasher.name}:{progress.hasher.hexdigest()}"
             
             # Validate download
-            if self._validate_download(destination, file_info):
-                self.logger.info(f"Successfully downloaded {file_info.filename}")
-                return True
-            else:
+            if not self._validate_download(part_path, file_info):
                 self.logger.error(f"Download validation failed for {file_info.filename}")
-                destination.unlink(missing_ok=True)
                 return False
+            
+            # Only replace the previous copy and its validators once the new one is known good
+            os.replace(part_path, destination)
+            self.cache.update_file_entry(
+                file_info.url,
+                etag=response_headers.get('ETag'),
+                last_modified=response_headers.get('Last-Modified'),
+                checksum=file_info.checksum
+            )
+            
+            elapsed = max(time.monotonic() - started, 1e-6)
+            size_mib = destination.stat().st_size / (1 << 20)
+            self.logger.info(
+                f"Successfully downloaded {file_info.filename} "
+                f"({size_mib:.1f} MiB in {elapsed:.1f}s, {size_mib / elapsed:.1f} MiB/s)"
+            )
+            return True
                 
         except Exception as e:
             self.logger.error(f"Error downloading {file_info.filename}: {e}")
             return False
+        
+        finally:
+            part_path.unlink(missing_ok=True)
+    
+    async def _fetch(self,
+                     session: aiohttp.ClientSession,
+                     file_info: FileInfo,
+                     part_path: Path,
+                     headers: Dict[str, str],
+                     allow_ranges: bool = True) -> Optional[Tuple[Mapping[str, str], DownloadProgress]]:
+        """Fetch the body into part_path, returns the response headers and progress or None on 304 Not Modified"""
+        ranges = self._plan_ranges(file_info) if allow_ranges else []
+        first_headers = dict(headers)
+        if ranges:
+            first_headers['Range'] = f"bytes={ranges[0][0]}-{ranges[0][1]}"
+        
+        async with session.get(file_info.url, headers=first_headers) as response:
+            if response.status == 304:
+                return None
+            
+            response.raise_for_status()
+            self.logger.info(f"Downloading {file_info.filename}...")
+            
+            # Server ignored the Range header or the file is small: single stream
+            if response.status != 206:
+                progress = self._new_progress(file_info.filename, int(response.headers.get('content-length', 0)))
+                progress.hasher = create_hasher()
+                async with aiofiles.open(part_path, 'wb', buffering=0) as f:
+                    await self._write_body(response, f, progress)
+                return response.headers, progress
+            
+            # If-Range makes the server send 200 instead of 206 if the file changes mid-download
+            if_range = self._if_range_validator(response.headers)
+            complete_length = self._complete_length(response.headers)
+            if if_range is not None and complete_length == file_info.size:
+                # Pre-size the file so every range can write at its own offset
+                progress = self._new_progress(file_info.filename, file_info.size)
+                async with aiofiles.open(part_path, 'wb') as f:
+                    await f.truncate(file_info.size)
+                
+                tasks = [asyncio.ensure_future(self._write_range(response, part_path, ranges[0], progress))]
+                tasks.extend(
+                    asyncio.ensure_future(
+                        self._fetch_range(session, file_info, part_path, byte_range, if_range, progress)
+                    )
+                    for byte_range in ranges[1:]
+                )
+                try:
+                    await asyncio.gather(*tasks)
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    raise
+                
+                return response.headers, progress
+        
+        # The ranges were planned for another size, or nothing can keep them on the same version of the file
+        if if_range is None:
+            self.logger.info(f"No strong validator for {file_info.filename}, downloading it as a single stream")
+        else:
+            self.logger.info(
+                f"{file_info.filename} is {complete_length} bytes, not {file_info.size}, downloading it as a single stream"
+            )
+        return await self._fetch(session, file_info, part_path, headers, allow_ranges=False)
+    
+    @staticmethod
+    def _if_range_validator(headers: Mapping[str, str]) -> Optional[str]:
+        """Strong ETag or Last-Modified for If-Range, weak ETags must not be sent (RFC 9110 13.1.5)"""
+        etag = headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return headers.get('Last-Modified')
+    
+    @staticmethod
+    def _complete_length(headers: Mapping[str, str]) -> Optional[int]:
+        """Complete length from a 206 Content-Range ("bytes 0-99/1234"), None when absent or unknown ("*")"""
+        _, _, length = headers.get('Content-Range', '').rpartition('/')
+        return int(length) if length.isdigit() else None
+    
+    def _plan_ranges(self, file_info: FileInfo) -> List[Tuple[int, int]]:
+        """Split large range-capable files into inclusive byte ranges, empty for a single stream"""
+        if not file_info.accept_ranges or not file_info.size:
+            return []
+        
+        num_parts = min(self.MAX_RANGE_PARTS, file_info.size // self.RANGE_PART_SIZE)
+        if num_parts < 2:
+            return []
+        
+        bounds = [file_info.size * i // num_parts for i in range(num_parts + 1)]
+        return [(bounds[i], bounds[i + 1] - 1) for i in range(num_parts)]
+    
+    async def _fetch_range(self,
+                           session: aiohttp.ClientSession,
+                           file_info: FileInfo,
+                           part_path: Path,
+                           byte_range: Tuple[int, int],
+                           if_range: Optional[str],
+                           progress: DownloadProgress) -> None:
+        """Download one byte range into its slice of part_path"""
+        headers = {'Range': f"bytes={byte_range[0]}-{byte_range[1]}"}
+        if if_range:
+            headers['If-Range'] = if_range
+        
+        async with session.get(file_info.url, headers=headers) as response:
+            response.raise_for_status()
+            if response.status != 206:
+                raise aiohttp.ClientPayloadError(f"Range {headers['Range']} not honoured (HTTP {response.status})")
+            await self._write_range(response, part_path, byte_range, progress)
+    
+    async def _write_range(self,
+                           response: aiohttp.ClientResponse,
+                           part_path: Path,
+                           byte_range: Tuple[int, int],
+                           progress: DownloadProgress) -> None:
+        """Write a 206 response body at its offset and check it was complete"""
+        async with aiofiles.open(part_path, 'r+b', buffering=0) as f:
+            await f.seek(byte_range[0])
+            written = await self._write_body(response, f, progress)
+        
+        if written != byte_range[1] - byte_range[0] + 1:
+            raise aiohttp.ClientPayloadError(f"Incomplete range {byte_range[0]}-{byte_range[1]}: got {written} bytes")
+    
+    async def _write_body(self, response: aiohttp.ClientResponse, f: Any, progress: DownloadProgress) -> int:
+        """Stream a response body to an open file, returns the number of bytes written"""
+        written = 0
+        
+        async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+            await f.write(chunk)
+            written += len(chunk)
+            progress.downloaded += len(chunk)
+            if progress.hasher is not None:
+                progress.hasher.update(chunk)
+            if progress.downloaded >= progress.next_log:
+                self._log_progress(progress)
+        
+        return written
     
     def _validate_existing_file(self, file_path: Path, file_info: FileInfo) -> bool:
         """Validate existing file against metadata"""
@@ -282,35 +658,46 @@ class FileDownloader(IFileDownloader):
         return True
     
     def _validate_download(self, file_path: Path, file_info: FileInfo) -> bool:
-        """Validate downloaded file"""
+        """Validate downloaded file by size and ZIP central directory, without decompressing members"""
         if not file_path.exists():
             return False
         
         # Check file size
-        if file_info.size and file_path.stat().st_size != file_info.size:
+        file_size = file_path.stat().st_size
+        if file_info.size and file_size != file_info.size:
             return False
         
-        # Verify it's a valid zip file
+        # Opening the archive only parses the central directory; every member must lie within the file
         try:
             with zipfile.ZipFile(file_path, 'r') as zf:
-                zf.testzip()
-            return True
+                return all(info.header_offset + info.compress_size <= file_size for info in zf.infolist())
         except zipfile.BadZipFile:
             return False
     
-    def _log_progress(self, downloaded: int, total: int, filename: str) -> None:
-        """Log download progress"""
-        if total > 0:
-            percent = (downloaded / total) * 100
-            if percent % 25 == 0:  # Log every 25%
-                self.logger.info(f"Download progress for {filename}: {percent:.0f}%")
+    def _new_progress(self, filename: str, total: int) -> DownloadProgress:
+        """Create a progress counter, only files of PROGRESS_MIN_SIZE or more log intermediate progress"""
+        progress = DownloadProgress(filename, total)
+        if total >= self.PROGRESS_MIN_SIZE:
+            progress.next_log = total // 4
+        return progress
+    
+    def _log_progress(self, progress: DownloadProgress) -> None:
+        """Log download progress and move the threshold to the next 25% byte boundary"""
+        step = progress.total // 4
+        progress.next_log = (progress.downloaded // step + 1) * step
+        self.logger.info(f"Download progress for {progress.filename}: {progress.downloaded * 100 // progress.total}%")
 
 
 class ZipProcessor(IFileProcessor):
     """Concrete implementation for processing ZIP files"""
     
-    def __init__(self, config: Config):
+    def __init__(self,
+                 config: Config,
+                 member_filter: Optional[Callable[[Path], bool]] = None,
+                 stream_processors: Optional[List[IStreamProcessor]] = None):
         self.config = config
+        self.member_filter = member_filter
+        self.stream_processors = stream_processors or []
         self.logger = logging.getLogger(__name__)
     
     def can_process(self, file_path: Path) -> bool:
@@ -318,129 +705,460 @@ class ZipProcessor(IFileProcessor):
         return file_path.suffix.lower() == '.zip'
     
     def process(self, file_path: Path, output_dir: Path) -> List[Path]:
-        """Extract ZIP file and return list of extracted files"""
-        extracted_files = []
+        """Stream members to a stream processor without touching disk, extract other wanted members"""
+        result_files = []
+        failed_members = []
+        extracted_count = 0
+        extract_dir = output_dir / file_path.stem
         
-        try:
-            extract_dir = output_dir / file_path.stem
-            extract_dir.mkdir(parents=True, exist_ok=True)
-            
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
+        for stream_processor in self.stream_processors:
+            stream_processor.begin_archive(file_path)
+        
+        with zipfile.ZipFile(file_path, 'r') as zip_ref:
+            for member in zip_ref.infolist():
+                if member.is_dir():
+                    continue
                 
-                for member in zip_ref.namelist():
-                    extracted_path = extract_dir / member
-                    if extracted_path.is_file():
-                        extracted_files.append(extracted_path)
-            
-            self.logger.info(f"Extracted {len(extracted_files)} files from {file_path.name}")
-            return extracted_files
-            
-        except Exception as e:
-            self.logger.error(f"Error processing ZIP file {file_path}: {e}")
-            return []
+                member_path = Path(member.filename)
+                stream_processor = next(
+                    (p for p in self.stream_processors if p.can_process(member_path)), None
+                )
+                
+                # Keep going after a bad member so the rest of the archive is still converted
+                try:
+                    if stream_processor is not None:
+                        with zip_ref.open(member) as stream:
+                            result_files.extend(stream_processor.process_stream(
+                                stream, str(Path(file_path.stem) / member.filename), output_dir
+                            ))
+                    elif not self.member_filter or self.member_filter(member_path):
+                        extract_dir.mkdir(parents=True, exist_ok=True)
+                        result_files.append(Path(zip_ref.extract(member, extract_dir)))
+                        extracted_count += 1
+                except Exception as e:
+                    self.logger.error(f"Error processing {member.filename} in {file_path.name}: {e}")
+                    failed_members.append(member.filename)
+        
+        if failed_members:
+            raise RuntimeError(f"{len(failed_members)} member(s) of {file_path.name} failed: {', '.join(failed_members)}")
+        
+        self.logger.info(
+            f"Processed {len(result_files)} files from {file_path.name} ({extracted_count} extracted)"
+        )
+        return result_files
 
 
-class CSVToJSONConverter(IFileProcessor):
+class CSVToJSONConverter(IFileProcessor, IStreamProcessor):
     """Concrete implementation for converting CSV to JSON"""
     
+    SAMPLE_SIZE = 64 * 1024
+    SNIFF_SIZE = 8 * 1024  # Sniffer cost grows faster than linearly with the sample
+    ARROW_BLOCK_SIZE = 8 << 20
+    PARALLEL_BLOCK_SIZE = 8 << 20
+    SPOOL_CHUNK_SIZE = 1 << 20
+    TRUE_VALUES = ('true', 'yes')
+    FALSE_VALUES = ('false', 'no')
+    
+    # Cheap regex prefilters so int()/float() are only called on values they accept;
+    # ints are capped at 18 digits to stay within the 64-bit range orjson can encode
+    _INT_RE = re.compile(r'[-+]?\d{1,18}')
+    _FLOAT_RE = re.compile(r'[-+]?(?:\d+\.\d*|\.\d+)(?:[eE][-+]?\d+)?|[-+]?\d+[eE][-+]?\d+')
+    _TRUE_SET = frozenset(TRUE_VALUES + ('1',))
+    _BOOL_SET = frozenset(TRUE_VALUES + FALSE_VALUES + ('1', '0'))
+    _ASCII_WHITESPACE = ' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'  # What str.strip() removes from ASCII text
+    
     def __init__(self, config: Config):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self._dialects: Dict[Path, Tuple[str, str]] = {}
     
     def can_process(self, file_path: Path) -> bool:
         """Check if file is a CSV"""
         return file_path.suffix.lower() == '.csv'
     
     def process(self, file_path: Path, output_dir: Path) -> List[Path]:
-        """Convert CSV to JSON"""
+        """Convert CSV to JSON Lines (.jsonl): one JSON object per row, no enclosing array"""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        json_path = output_dir / f"{file_path.stem}.jsonl"
+        
+        with open(file_path, 'rb') as f:
+            encoding, delimiter = self._detect_dialect(None, f)
+        row_count = self._stream_convert(file_path, file_path.name, json_path, encoding, delimiter)
+        
+        self.logger.info(f"Converted {file_path.name} to {json_path.name} ({row_count} rows)")
+        return [json_path]
+    
+    def begin_archive(self, archive_path: Path) -> None:
+        """Forget dialects detected for the previous archive (or an earlier copy of this one)"""
+        self._dialects.clear()
+    
+    def process_stream(self, stream: BinaryIO, name: str, output_dir: Path) -> List[Path]:
+        """Convert a CSV read from a seekable binary stream (e.g. a ZIP member) to JSON Lines"""
+        csv_path = output_dir / name
+        output_dir.mkdir(parents=True, exist_ok=True)
+        json_path = output_dir / f"{csv_path.stem}.jsonl"
+        
+        encoding, delimiter = self._detect_dialect(csv_path.parent, stream)
+        row_count = self._stream_convert(stream, csv_path.name, json_path, encoding, delimiter)
+        
+        self.logger.info(f"Converted {name} to {json_path.name} ({row_count} rows)")
+        return [json_path]
+    
+    def _stream_convert(self,
+                        source: Union[Path, BinaryIO],
+                        name: str,
+                        json_path: Path,
+                        encoding: str,
+                        delimiter: str) -> int:
+        """Stream CSV rows from a file path or seekable stream into JSON Lines, returns the row count"""
+        tmp_path = json_path.with_name(json_path.name + '.tmp')
+        
         try:
-            output_dir.mkdir(parents=True, exist_ok=True)
-            json_path = output_dir / f"{file_path.stem}.json"
+            try:
+                row_count = self._convert_source(source, name, tmp_path, encoding, delimiter)
+            except UnicodeDecodeError as e:
+                # The sample decoded as UTF-8 but later bytes do not: start over instead of replacing them
+                self.logger.warning(f"{name} is not UTF-8 beyond the detection sample ({e.reason}), re-reading it as Latin-1")
+                if not isinstance(source, Path):
+                    source.seek(0)
+                row_count = self._convert_source(source, name, tmp_path, 'latin-1', delimiter)
             
-            data = self._read_csv(file_path)
-            self._write_json(data, json_path)
+            os.replace(tmp_path, json_path)
+            return row_count
+        
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    
+    def _convert_source(self,
+                        source: Union[Path, BinaryIO],
+                        name: str,
+                        tmp_path: Path,
+                        encoding: str,
+                        delimiter: str) -> int:
+        """Write source as JSON Lines to tmp_path, raising UnicodeDecodeError for bytes invalid in encoding"""
+        with open(tmp_path, 'wb') as out:
+            if pa is not None:
+                try:
+                    return self._write_rows(out, self._iter_arrow_rows(source, encoding, delimiter))
+                except pa.ArrowInvalid as e:
+                    if 'UTF8' in str(e):
+                        raise UnicodeDecodeError(encoding, b'', 0, 0, str(e)) from e
+                    
+                    # Ragged rows, which the Python parser pads or truncates
+                    self.logger.warning(f"Falling back to Python CSV parser for {name}: {e}")
+                    out.seek(0)
+                    out.truncate()
+                    if not isinstance(source, Path):
+                        source.seek(0)
             
-            self.logger.info(f"Converted {file_path.name} to {json_path.name}")
-            return [json_path]
+            if isinstance(source, Path):
+                return self._write_python_rows(out, source, encoding, delimiter)
             
-        except Exception as e:
-            self.logger.error(f"Error converting CSV {file_path}: {e}")
-            return []
+            # Worker processes map row blocks from a file, so copy the stream next to the output first
+            with tempfile.NamedTemporaryFile(dir=tmp_path.parent, suffix='.csv') as spool:
+                shutil.copyfileobj(source, spool, self.SPOOL_CHUNK_SIZE)
+                spool.flush()
+                return self._write_python_rows(out, Path(spool.name), encoding, delimiter)
     
-    def _read_csv(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Read CSV file with intelligent handling"""
-        data = []
+    def _write_rows(self, out: BinaryIO, rows: Iterable[Dict[str, Any]]) -> int:
+        """Write rows as JSON Lines, returns the row count"""
+        row_count = 0
         
-        # Try different encodings
-        encodings = ['utf-8', 'latin-1', 'cp1252']
+        for row in rows:
+            out.write(orjson.dumps(row, default=str, option=orjson.OPT_APPEND_NEWLINE))
+            row_count += 1
         
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding, newline='') as csvfile:
-                    # Detect delimiter
-                    sample = csvfile.read(1024)
-                    csvfile.seek(0)
-                    
-                    sniffer = csv.Sniffer()
-                    delimiter = sniffer.sniff(sample).delimiter
-                    
-                    reader = csv.DictReader(csvfile, delimiter=delimiter)
-                    data = [self._clean_row(row) for row in reader]
-                    break
-                    
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                self.logger.warning(f"Error reading CSV with encoding {encoding}: {e}")
-                continue
+        return row_count
+    
+    def _write_python_rows(self, out: BinaryIO, csv_path: Path, encoding: str, delimiter: str) -> int:
+        """Convert with the Python cleaner, fanning row-aligned blocks out to worker processes"""
+        ranges = self._split_row_ranges(csv_path, delimiter.encode(encoding))
+        if not ranges:
+            return 0
+        
+        # First range is the header row
+        header_start, header_end = ranges[0]
+        with open(csv_path, 'rb') as f:
+            header_text = f.read(header_end - header_start).decode(self._header_encoding(encoding))
+        header = self._clean_header(next(csv.reader(io.StringIO(header_text, newline=''), delimiter=delimiter), []))
         
-        if not data:
-            raise Exception("Could not read CSV file with any encoding")
+        blocks = [(str(csv_path), start, end, encoding, delimiter, header) for start, end in ranges[1:]]
+        row_count = 0
         
-        return data
+        if len(blocks) > 1:
+            with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(blocks))) as executor:
+                for buffer, count in executor.map(self._convert_block, *zip(*blocks)):
+                    out.write(buffer)
+                    row_count += count
+        else:
+            for block in blocks:
+                buffer, count = self._convert_block(*block)
+                out.write(buffer)
+                row_count += count
+        
+        return row_count
     
-    def _clean_row(self, row: Dict[str, str]) -> Dict[str, Any]:
-        """Clean and type-convert row data"""
-        cleaned = {}
+    def _split_row_ranges(self, csv_path: Path, delimiter: bytes) -> List[Tuple[int, int]]:
+        """Split the file into byte ranges ending on row boundaries, the first range is the header"""
+        ranges = []
         
-        for key, value in row.items():
-            # Clean key
-            clean_key = key.strip() if key else 'unnamed_column'
+        with open(csv_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ranges
             
-            # Clean and convert value
-            if value is None or value.strip() == '':
-                cleaned[clean_key] = None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start, target = 0, 1
+                while start < len(mm):
+                    end = self._next_row_end(mm, start, min(start + target, len(mm)), delimiter)
+                    ranges.append((start, end))
+                    start, target = end, self.PARALLEL_BLOCK_SIZE
+        
+        return ranges
+    
+    @staticmethod
+    def _next_row_end(mm: mmap.mmap, start: int, pos: int, delimiter: bytes) -> int:
+        """Offset just past the first newline at or after pos that is not inside a quoted field,
+        scanning quoted fields from the row boundary at start"""
+        quote = mm.find(b'"', start)
+        
+        while True:
+            newline = mm.find(b'\n', pos)
+            if newline == -1:
+                return len(mm)
+            
+            while quote != -1 and quote < newline:
+                # Like csv.reader, a quote only opens a field at its first character;
+                # anywhere else (e.g. 5'10") it is literal text
+                opens_field = (
+                    quote == start
+                    or mm[quote - 1:quote] in (b'\n', b'\r')
+                    or mm[quote - len(delimiter):quote] == delimiter
+                )
+                if not opens_field:
+                    quote = mm.find(b'"', quote + 1)
+                    continue
+                
+                # Skip to the closing quote, "" is an escaped quote inside the field
+                close = mm.find(b'"', quote + 1)
+                while close != -1 and mm[close + 1:close + 2] == b'"':
+                    close = mm.find(b'"', close + 2)
+                if close == -1:
+                    return len(mm)
+                
+                quote = mm.find(b'"', close + 1)
+                if close > newline:
+                    # The newline was inside the quoted field, look past it
+                    pos = close + 1
+                    break
+            else:
+                return newline + 1
+    
+    def _convert_block(self,
+                       csv_path: str,
+                       start: int,
+                       end: int,
+                       encoding: str,
+                       delimiter: str,
+                       header: List[str]) -> Tuple[bytes, int]:
+        """Convert one block of rows to JSON Lines (runs in a worker process)"""
+        with open(csv_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            rows = [
+                orjson.dumps(self._clean_row(header, values), default=str, option=orjson.OPT_APPEND_NEWLINE)
+                for values in self._iter_block_values(mm, start, end, encoding, delimiter)
+                if values
+            ]
+        
+        return b''.join(rows), len(rows)
+    
+    def _iter_block_values(self,
+                           mm: mmap.mmap,
+                           start: int,
+                           end: int,
+                           encoding: str,
+                           delimiter: str) -> Iterator[List[str]]:
+        """Split a block into field lists, quote-free lines are split directly and only quoted rows use csv"""
+        pos = start
+        
+        while pos < end:
+            # Lines before the row holding the next quote cannot contain quoted fields
+            quote = mm.find(b'"', pos, end)
+            run_end = end if quote == -1 else mm.rfind(b'\n', pos, quote) + 1
+            
+            if run_end > pos:
+                for line in mm[pos:run_end].decode(encoding).split('\n'):
+                    line = line.rstrip('\r')
+                    if line:
+                        yield line.split(delimiter)
+                pos = run_end
+            
+            if quote != -1:
+                # Quoted fields may contain newlines, so extend to the real end of the row
+                row_end = min(self._next_row_end(mm, pos, pos, delimiter.encode(encoding)), end)
+                text = mm[pos:row_end].decode(encoding)
+                yield from csv.reader(io.StringIO(text, newline=''), delimiter=delimiter)
+                pos = row_end
+    
+    def _iter_arrow_rows(self,
+                         source: Union[Path, BinaryIO],
+                         encoding: str,
+                         delimiter: str) -> Iterator[Dict[str, Any]]:
+        """Tokenize the CSV natively with pyarrow, typing whole columns with the same rules as the Python path"""
+        # Inference picks one type per column, so read every column as text and type the cells with compute kernels
+        header = self._read_header(source, encoding, delimiter)
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(block_size=self.ARROW_BLOCK_SIZE, encoding=encoding),
+            parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in header},
+                strings_can_be_null=False,
+                check_utf8=True
+            )
+        )
+        names = self._clean_header(reader.schema.names)
+        
+        # Like _clean_row, a repeated column name keeps the last non-empty value
+        keys = list(dict.fromkeys(names))
+        positions = [[i for i, name in enumerate(names) if name == key][::-1] for key in keys]
+        
+        for batch in reader:
+            columns = self._batch_values(batch)
+            merged = [self._coalesce([columns[i] for i in indices]) for indices in positions]
+            yield from (dict(zip(keys, values)) for values in zip(*merged))
+    
+    def _batch_values(self, batch: 'pa.RecordBatch') -> List[List[Any]]:
+        """Typed values of every column, raising ArrowInvalid for any column not read as text"""
+        for field in batch.schema:
+            if not pa.types.is_string(field.type):
+                raise pa.ArrowInvalid(f"Column {field.name!r} was read as {field.type}, not text")
+        
+        return [self._column_values(column) for column in batch.columns]
+    
+    def _column_values(self, column: 'pa.Array') -> List[Any]:
+        """Type a text column with vectorised kernels, cell for cell the same result as _convert_value"""
+        if not pc.all(pc.string_is_ascii(column)).as_py():
+            # Unicode digits and whitespace follow the regex rules, leave them to Python
+            return [self._convert_value(value) if value else None for value in (v.strip() for v in column.to_pylist())]
+        
+        null = pa.scalar(None, pa.string())
+        values = pc.utf8_trim(column, characters=self._ASCII_WHITESPACE)
+        is_int = pc.match_substring_regex(values, f"^(?:{self._INT_RE.pattern})$")
+        is_float = pc.match_substring_regex(values, f"^(?:{self._FLOAT_RE.pattern})$")
+        is_bool = pc.and_not(pc.is_in(pc.utf8_lower(values), value_set=pa.array(sorted(self._BOOL_SET))), is_int)
+        is_text = pc.invert(pc.or_(pc.or_(pc.equal(values, ''), is_int), pc.or_(is_float, is_bool)))
+        
+        # One typed array per kind of cell present, null everywhere else
+        parts = []
+        if pc.any(is_int).as_py():
+            # Arrow's integer parser rejects an explicit plus sign
+            ints = pc.replace_substring_regex(pc.if_else(is_int, values, null), r'^\+', '')
+            parts.append(pc.cast(ints, pa.int64()))
+        if pc.any(is_float).as_py():
+            parts.append(pc.cast(pc.if_else(is_float, values, null), pa.float64()))
+        if pc.any(is_bool).as_py():
+            true_set = pa.array(sorted(self._TRUE_SET))
+            parts.append(pc.if_else(is_bool, pc.is_in(pc.utf8_lower(values), value_set=true_set), None))
+        if pc.any(is_text).as_py():
+            parts.append(pc.if_else(is_text, values, null))
+        
+        if not parts:
+            return [None] * len(column)
+        return self._coalesce([part.to_pylist() for part in parts])
+    
+    @staticmethod
+    def _coalesce(columns: List[List[Any]]) -> List[Any]:
+        """Merge equal-length value lists, taking the first non-null value at each position"""
+        merged = columns[0]
+        for column in columns[1:]:
+            merged = [value if value is not None else other for value, other in zip(merged, column)]
+        return merged
+    
+    def _read_header(self, source: Union[Path, BinaryIO], encoding: str, delimiter: str) -> List[str]:
+        """Parse the raw header row with csv, rewinding a stream source"""
+        f = open(source, 'rb') if isinstance(source, Path) else source
+        text = io.TextIOWrapper(f, encoding=self._header_encoding(encoding), newline='')
+        
+        try:
+            return next(csv.reader(text, delimiter=delimiter), [])
+        finally:
+            text.detach()
+            if f is source:
+                source.seek(0)
             else:
-                cleaned[clean_key] = self._convert_value(value.strip())
+                f.close()
+    
+    def _detect_dialect(self, key: Optional[Path], stream: BinaryIO) -> Tuple[str, str]:
+        """Encoding and delimiter, shared by an archive's CSVs with the same key (None: not shared); rewinds stream"""
+        if key in self._dialects:
+            return self._dialects[key]
+        
+        sample = stream.read(self.SAMPLE_SIZE)
+        stream.seek(0)
+        
+        encoding = self._detect_encoding(sample)
+        delimiter = self.config.csv_delimiter
+        
+        if delimiter is None:
+            delimiter = self._detect_delimiter(sample.decode(encoding, errors='replace')[:self.SNIFF_SIZE])
+        
+        if key is not None:
+            self._dialects[key] = (encoding, delimiter)
+        return encoding, delimiter
+    
+    def _detect_encoding(self, sample: bytes) -> str:
+        """Pick UTF-8 when the leading sample decodes cleanly, otherwise Latin-1"""
+        try:
+            # Incremental decode tolerates a multi-byte character cut at the sample boundary
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'latin-1'
+    
+    def _detect_delimiter(self, sample: str) -> str:
+        """Sniff the delimiter from a sample, defaulting to comma"""
+        try:
+            return csv.Sniffer().sniff(sample).delimiter
+        except csv.Error:
+            return ','
+    
+    @staticmethod
+    def _header_encoding(encoding: str) -> str:
+        """Codec for text starting at the header, dropping a UTF-8 byte order mark like Arrow does"""
+        return 'utf-8-sig' if encoding == 'utf-8' else encoding
+    
+    def _clean_header(self, header: List[str]) -> List[str]:
+        """Strip and intern column names once per file, every row reuses these key objects"""
+        return [sys.intern(key.strip()) if key and key.strip() else 'unnamed_column' for key in header]
+    
+    def _clean_row(self, header: List[str], values: List[str]) -> Dict[str, Any]:
+        """Clean and type-convert row data, short rows are padded with nulls and extra values dropped"""
+        if fast_clean is not None:
+            return fast_clean.clean_row(header, values, self._TRUE_SET, self._BOOL_SET, self._convert_value)
+        
+        cleaned = dict.fromkeys(header)
+        
+        for key, value in zip(header, values):
+            # Clean and convert value
+            value = value.strip()
+            if value:
+                cleaned[key] = self._convert_value(value)
         
         return cleaned
     
     def _convert_value(self, value: str) -> Any:
         """Attempt to convert string value to appropriate type"""
-        # Try integer
-        try:
+        if self._INT_RE.fullmatch(value):
             return int(value)
-        except ValueError:
-            pass
         
-        # Try float
-        try:
+        if self._FLOAT_RE.fullmatch(value):
             return float(value)
-        except ValueError:
-            pass
         
-        # Try boolean
-        if value.lower() in ('true', 'false', 'yes', 'no', '1', '0'):
-            return value.lower() in ('true', 'yes', '1')
+        lowered = value.lower()
+        if lowered in self._BOOL_SET:
+            return lowered in self._TRUE_SET
         
         # Return as string
         return value
-    
-    def _write_json(self, data: List[Dict[str, Any]], output_path: Path) -> None:
-        """Write data to JSON file"""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
 
 
 class LoggingNotificationService(INotificationService):
@@ -471,13 +1189,15 @@ class IATTCDataMonitor:
                  website_monitor: IWebsiteMonitor,
                  file_downloader: IFileDownloader,
                  file_processors: List[IFileProcessor],
-                 notification_service: INotificationService):
+                 notification_service: INotificationService,
+                 cache: ICacheStore):
         
         self.config = config
         self.website_monitor = website_monitor
         self.file_downloader = file_downloader
         self.file_processors = file_processors
         self.notification_service = notification_service
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
         
         # Create directories
@@ -486,73 +1206,132 @@ class IATTCDataMonitor:
     
     def run_monitoring_cycle(self) -> None:
         """Run a single monitoring cycle"""
+        asyncio.run(self._run_cycle())
+    
+    async def _run_cycle(self) -> None:
+        """Monitoring cycle coroutine, all network I/O shares one event loop and session"""
+        async with make_session(self.config) as session:
+            await self._run_cycle_with_session(session)
+    
+    async def _run_cycle_with_session(self, session: aiohttp.ClientSession) -> None:
+        """Run the monitoring steps over an open HTTP session"""
         try:
             self.logger.info("Starting monitoring cycle...")
             
             # Check for changes
-            if not self.website_monitor.detect_changes(self.config.base_url):
+            if not await self.website_monitor.detect_changes(session, self.config.base_url):
                 self.logger.info("No changes detected")
                 return
             
             self.notification_service.notify("Changes detected on IATTC website")
             
             # Get available ZIP files
-            zip_files = self.website_monitor.get_zip_files(self.config.base_url)
+            zip_files = await self.website_monitor.get_zip_files(session, self.config.base_url)
             if not zip_files:
                 self.logger.warning("No ZIP files found")
                 return
             
+            # Skip files already processed at their current server version
+            new_files = self._select_new_files(zip_files)
+            if not new_files:
+                self.logger.info(f"All {len(zip_files)} ZIP files already processed")
+                self.website_monitor.commit_changes()
+                return
+            
             # Download files concurrently
-            downloaded_files = self._download_files_concurrently(zip_files)
+            downloaded_files = await self._download_all(session, new_files)
             
-            # Process files
-            processed_files = self._process_files(downloaded_files)
+            # Process files off the event loop so stop signals are handled, recording each archive once it converts cleanly
+            failed: List[FileInfo] = []
+            processed_files = await asyncio.to_thread(self._process_files, downloaded_files, failed)
             
             success_msg = f"Successfully processed {len(processed_files)} files"
             self.logger.info(success_msg)
             self.notification_service.notify(success_msg)
             
+            # Only an unchanged page whose files all went through may skip the next cycle
+            unfinished = len(new_files) - len(downloaded_files) + len(failed)
+            if unfinished:
+                self.logger.warning(f"{unfinished} ZIP files failed, they will be retried next cycle")
+            else:
+                self.website_monitor.commit_changes()
+            
         except Exception as e:
             error_msg = f"Error in monitoring cycle: {e}"
             self.logger.error(error_msg)
             self.notification_service.notify(error_msg, "ERROR")
     
-    def _download_files_concurrently(self, zip_files: List[FileInfo]) -> List[Path]:
-        """Download files using thread pool"""
-        downloaded_files = []
+    def _select_new_files(self, zip_files: List[FileInfo]) -> List[FileInfo]:
+        """Drop duplicate URLs and files whose server version matches the last processed one"""
+        cached_files = self.cache.load().get('files', {})
+        seen: Set[str] = set()
+        new_files = []
         
-        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
-            future_to_file = {
-                executor.submit(
-                    self.file_downloader.download,
-                    file_info,
-                    Path(self.config.download_dir) / file_info.filename
-                ): file_info for file_info in zip_files
-            }
+        for file_info in zip_files:
+            if file_info.url in seen:
+                continue
+            seen.add(file_info.url)
             
-            for future in as_completed(future_to_file):
-                file_info = future_to_file[future]
-                try:
-                    if future.result():
-                        file_path = Path(self.config.download_dir) / file_info.filename
-                        downloaded_files.append(file_path)
-                except Exception as e:
-                    self.logger.error(f"Error downloading {file_info.filename}: {e}")
+            version = self._file_version(file_info)
+            if version is None or cached_files.get(file_info.url, {}).get('processed') != version:
+                new_files.append(file_info)
+        
+        return new_files
+    
+    def _file_version(self, file_info: FileInfo) -> Optional[List[Any]]:
+        """Server-side identity of a file, or None when the server reported no metadata"""
+        if not (file_info.etag or file_info.last_modified):
+            return None
+        return [file_info.etag, file_info.last_modified, file_info.size]
+    
+    async def _download_all(self, session: aiohttp.ClientSession, zip_files: List[FileInfo]) -> List[Tuple[FileInfo, Path]]:
+        """Download files concurrently on the event loop"""
+        downloaded_files = []
+        semaphore = asyncio.Semaphore(self.config.max_workers)
+        
+        async def download(file_info: FileInfo) -> bool:
+            async with semaphore:
+                return await self.file_downloader.download(
+                    session, file_info, Path(self.config.download_dir) / file_info.filename
+                )
+        
+        results = await asyncio.gather(
+            *(download(file_info) for file_info in zip_files),
+            return_exceptions=True
+        )
+        
+        for file_info, result in zip(zip_files, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error downloading {file_info.filename}: {result}")
+            elif result:
+                downloaded_files.append((file_info, Path(self.config.download_dir) / file_info.filename))
         
         return downloaded_files
     
-    def _process_files(self, file_paths: List[Path]) -> List[Path]:
-        """Process files through the processor chain"""
+    def _process_files(self,
+                       downloaded_files: List[Tuple[FileInfo, Path]],
+                       failed: Optional[List[FileInfo]] = None) -> List[Path]:
+        """Process files through the processor chain, marking each fully processed download in the cache"""
         all_processed_files = []
         
-        for file_path in file_paths:
-            processed_files = self._process_single_file(file_path)
+        for file_info, file_path in downloaded_files:
+            failed_paths: List[Path] = []
+            processed_files = self._process_single_file(file_path, failed_paths)
             all_processed_files.extend(processed_files)
+            
+            if failed_paths:
+                if failed is not None:
+                    failed.append(file_info)
+                continue
+            
+            version = self._file_version(file_info)
+            if version is not None:
+                self.cache.update_file_entry(file_info.url, processed=version)
         
         return all_processed_files
     
-    def _process_single_file(self, file_path: Path) -> List[Path]:
-        """Process a single file through appropriate processors"""
+    def _process_single_file(self, file_path: Path, failed: Optional[List[Path]] = None) -> List[Path]:
+        """Process a single file through appropriate processors, collecting paths that errored into failed"""
         processed_files = []
         
         # Find appropriate processor
@@ -565,27 +1344,54 @@ class IATTCDataMonitor:
                     # If it's a ZIP processor, recursively process extracted files
                     if isinstance(processor, ZipProcessor):
                         for extracted_file in results:
-                            sub_processed = self._process_single_file(extracted_file)
+                            sub_processed = self._process_single_file(extracted_file, failed)
                             processed_files.extend(sub_processed)
                     
                 except Exception as e:
                     self.logger.error(f"Error processing {file_path} with {processor.__class__.__name__}: {e}")
+                    if failed is not None:
+                        failed.append(file_path)
         
         return processed_files
     
     def start_scheduled_monitoring(self) -> None:
         """Start scheduled monitoring"""
         self.logger.info(f"Starting scheduled monitoring every {self.config.check_interval_minutes} minutes")
+        asyncio.run(self._scheduler())
+    
+    async def _scheduler(self) -> None:
+        """Run cycles on one event loop and session, sleeping between them until a stop signal"""
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):  # Windows / non-main thread
+                pass
         
-        schedule.every(self.config.check_interval_minutes).minutes.do(self.run_monitoring_cycle)
-        
-        # Run initial cycle
-        self.run_monitoring_cycle()
+        async with make_session(self.config) as session:
+            while not stop.is_set():
+                cycle = asyncio.ensure_future(self._run_cycle_with_session(session))
+                stopping = asyncio.ensure_future(stop.wait())
+                await asyncio.wait((cycle, stopping), return_when=asyncio.FIRST_COMPLETED)
+                stopping.cancel()
+                
+                if not cycle.done():
+                    # Downloads stop at once, a conversion already running in its thread still finishes
+                    self.logger.info("Stop requested, cancelling the current cycle")
+                    cycle.cancel()
+                    try:
+                        await cycle
+                    except asyncio.CancelledError:
+                        pass
+                    break
+                
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.config.check_interval_minutes * 60)
+                except asyncio.TimeoutError:
+                    pass
         
-        # Keep running
-        while True:
-            schedule.run_pending()
-            time.sleep(60)
+        self.logger.info("Monitor stopped")
 
 
 # =============================================================================
@@ -604,27 +1410,55 @@ def setup_logging(config: Config) -> None:
     )
 
 
+def make_session(config: Config) -> aiohttp.ClientSession:
+    """Create the HTTP session shared by all components (must run inside the event loop)"""
+    connector = aiohttp.TCPConnector(
+        limit=max(config.max_concurrent_requests, config.max_workers * 2),
+        ttl_dns_cache=300,
+        keepalive_timeout=config.request_timeout
+    )
+    timeout = aiohttp.ClientTimeout(
+        sock_connect=config.request_timeout,
+        sock_read=config.request_timeout
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={'User-Agent': config.user_agent}
+    )
+
+
 def create_monitor(config: Config) -> IATTCDataMonitor:
     """Factory function to create configured monitor (Dependency Injection)"""
     
     # Create implementations
-    website_monitor = WebsiteMonitor(config)
-    file_downloader = FileDownloader(config)
+    cache = JsonFileCache(config)
+    website_monitor = WebsiteMonitor(config, cache)
+    file_downloader = FileDownloader(config, cache)
     notification_service = LoggingNotificationService()
     
     # Create processors (easily extensible)
-    file_processors = [
-        ZipProcessor(config),
-        CSVToJSONConverter(config)
+    csv_converter = CSVToJSONConverter(config)
+    file_processors: List[IFileProcessor] = [
+        csv_converter
     ]
     
+    # CSV members convert straight from the archive; only extract other members
+    # that some processor (including nested ZIPs) can handle
+    file_processors.insert(0, ZipProcessor(
+        config,
+        member_filter=lambda path: any(p.can_process(path) for p in file_processors),
+        stream_processors=[csv_converter]
+    ))
+    
     # Create and return monitor
     return IATTCDataMonitor(
         config=config,
         website_monitor=website_monitor,
         file_downloader=file_downloader,
         file_processors=file_processors,
-        notification_service=notification_service
+        notification_service=notification_service,
+        cache=cache
     )
 
 
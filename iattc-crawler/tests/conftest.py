@@ -0,0 +1,49 @@
+import contextlib
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'iattc-crawler.py'
+
+# Like running the script directly, so an optional fast_clean built next to it is importable
+sys.path.insert(0, str(SCRIPT.parent))
+
+
+def _load_crawler():
+    """Import the hyphenated script as a module (registered so worker processes can unpickle it)"""
+    if 'iattc_crawler' not in sys.modules:
+        spec = importlib.util.spec_from_file_location('iattc_crawler', SCRIPT)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['iattc_crawler'] = module
+        spec.loader.exec_module(module)
+    return sys.modules['iattc_crawler']
+
+
+@pytest.fixture
+def crawler():
+    return _load_crawler()
+
+
+@pytest.fixture
+def converter(crawler):
+    return crawler.CSVToJSONConverter(crawler.Config())
+
+
+@pytest.fixture
+def serve():
+    """Async context manager serving an aiohttp app on a free local port, yielding its base URL"""
+    @contextlib.asynccontextmanager
+    async def serve_app(app):
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', 0).start()
+        host, port = runner.addresses[0][:2]
+        try:
+            yield f"http://{host}:{port}"
+        finally:
+            await runner.cleanup()
+    
+    return serve_app
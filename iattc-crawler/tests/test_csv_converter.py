@@ -0,0 +1,187 @@
+import csv
+import io
+import zipfile
+
+import orjson
+import pytest
+
+
+def _convert(converter, csv_path, output_dir):
+    json_path, = converter.process(csv_path, output_dir)
+    return json_path.read_bytes()
+
+
+def test_arrow_and_python_paths_match(crawler, converter, tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    csv_path = tmp_path / 'mixed.csv'
+    csv_path.write_text(
+        'id,count,flag,score,note\n'
+        '1,12,yES,2, 7 \n'
+        '2,N/A,Yes,2.5,nan\n'
+        '3,,no,1e3,  \n'
+        '4,"5",TRUE,-0.0,"quoted, text"\n'
+    )
+    
+    arrow_output = _convert(converter, csv_path, tmp_path / 'arrow')
+    monkeypatch.setattr(crawler, 'pa', None)
+    python_output = _convert(crawler.CSVToJSONConverter(crawler.Config()), csv_path, tmp_path / 'python')
+    
+    assert arrow_output == python_output
+    assert arrow_output.splitlines()[0] == b'{"id":1,"count":12,"flag":true,"score":2,"note":7}'
+
+
+def test_bom_and_repeated_columns_stay_on_arrow_path(crawler, converter, tmp_path, monkeypatch, caplog):
+    pytest.importorskip('pyarrow')
+    csv_path = tmp_path / 'bom.csv'
+    csv_path.write_bytes('\ufeffid,v,v,n\n1,2,,\u0663\n2,,x,+7\n'.encode())
+    
+    arrow_output = _convert(converter, csv_path, tmp_path / 'arrow')
+    monkeypatch.setattr(crawler, 'pa', None)
+    python_output = _convert(crawler.CSVToJSONConverter(crawler.Config()), csv_path, tmp_path / 'python')
+    
+    assert 'Falling back' not in caplog.text
+    assert arrow_output == python_output
+    assert arrow_output.splitlines() == [b'{"id":1,"v":2,"n":3}', b'{"id":2,"v":"x","n":7}']
+
+
+@pytest.mark.parametrize('use_arrow', [True, False])
+def test_invalid_utf8_after_sample_is_reread_as_latin1(crawler, tmp_path, monkeypatch, use_arrow):
+    if use_arrow:
+        pytest.importorskip('pyarrow')
+    else:
+        monkeypatch.setattr(crawler, 'pa', None)
+    csv_path = tmp_path / 'late_bytes.csv'
+    rows = b''.join(b'%d,abc\n' % i for i in range(20000))
+    csv_path.write_bytes(b'id,name\n' + rows + b'20000,caf\xe9\n')
+    
+    output = _convert(crawler.CSVToJSONConverter(crawler.Config()), csv_path, tmp_path)
+    
+    assert output.count(b'"abc"') == 20000
+    assert output.splitlines()[-1] == '{"id":20000,"name":"café"}'.encode()
+
+
+def _reference_output(converter, csv_path):
+    """Expected JSON Lines: plain csv.reader rows through the same cleaner"""
+    with open(csv_path, newline='') as f:
+        reader = csv.reader(f)
+        header = converter._clean_header(next(reader))
+        return b''.join(
+            orjson.dumps(converter._clean_row(header, values), default=str, option=orjson.OPT_APPEND_NEWLINE)
+            for values in reader if values
+        )
+
+
+def _python_converter(crawler, monkeypatch, block_size):
+    monkeypatch.setattr(crawler, 'pa', None)
+    monkeypatch.setattr(crawler.CSVToJSONConverter, 'PARALLEL_BLOCK_SIZE', block_size)
+    return crawler.CSVToJSONConverter(crawler.Config())
+
+
+def test_stray_quotes_do_not_shift_row_boundaries(crawler, tmp_path, monkeypatch):
+    converter = _python_converter(crawler, monkeypatch, 4 << 10)
+    csv_path = tmp_path / 'stray.csv'
+    fields = ['5\'10" tall', '"multi\nline, ""quoted"""', '"a"b', '""', '42']
+    with open(csv_path, 'w', newline='') as f:
+        f.write('a,b,c\n')
+        for i in range(5000):
+            f.write(','.join(fields[(i + j) % len(fields)] for j in range(3)) + '\n')
+    
+    assert len(converter._split_row_ranges(csv_path, b',')) > 2
+    assert _convert(converter, csv_path, tmp_path / 'out') == _reference_output(converter, csv_path)
+
+
+@pytest.mark.parametrize('block_size', [1 << 10, 8 << 20])
+def test_quoted_multiline_fields_match_csv_reader(crawler, tmp_path, monkeypatch, block_size):
+    converter = _python_converter(crawler, monkeypatch, block_size)
+    csv_path = tmp_path / 'quoted.csv'
+    with open(csv_path, 'w', newline='') as f:
+        f.write('id,text,value\r\n')
+        for i in range(2000):
+            f.write(f'{i},"line one\nline ""{i}""\r\nline three",{i / 4}\r\n')
+            if i % 100 == 0:
+                f.write('\r\n')
+    
+    assert _convert(converter, csv_path, tmp_path / 'out') == _reference_output(converter, csv_path)
+
+
+def test_row_ranges_start_on_row_boundaries(crawler, tmp_path, monkeypatch):
+    converter = _python_converter(crawler, monkeypatch, 512)
+    csv_path = tmp_path / 'blocks.csv'
+    with open(csv_path, 'w', newline='') as f:
+        f.write('a,b\n')
+        for i in range(3000):
+            f.write(f'{i},"x,\n""{i}"""\n' if i % 3 else f'{i},plain\n')
+    
+    ranges = converter._split_row_ranges(csv_path, b',')
+    data = csv_path.read_bytes()
+    
+    assert len(ranges) > 2
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    
+    # Parsing each block on its own must give exactly the rows of the whole file
+    block_rows = [
+        row for start, end in ranges
+        for row in csv.reader(io.StringIO(data[start:end].decode(), newline=''))
+    ]
+    assert block_rows == list(csv.reader(io.StringIO(data.decode(), newline='')))
+
+
+def test_empty_and_header_only_files(crawler, tmp_path, monkeypatch):
+    converter = _python_converter(crawler, monkeypatch, 1 << 10)
+    empty, header_only = tmp_path / 'empty.csv', tmp_path / 'header.csv'
+    empty.write_bytes(b'')
+    header_only.write_bytes(b'a,b\n')
+    
+    assert _convert(converter, empty, tmp_path / 'out') == b''
+    assert _convert(converter, header_only, tmp_path / 'out') == b''
+
+
+def _zip_with(path, name, data):
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr(name, data)
+
+
+def test_dialect_is_redetected_for_a_republished_archive(crawler, converter, tmp_path):
+    zip_processor = crawler.ZipProcessor(crawler.Config(), stream_processors=[converter])
+    archive = tmp_path / 'data.zip'
+    
+    _zip_with(archive, 'catch.csv', 'year;tons\n2020;1.5\n')
+    first, = zip_processor.process(archive, tmp_path / 'out')
+    assert first.read_bytes() == b'{"year":2020,"tons":1.5}\n'
+    
+    _zip_with(archive, 'catch.csv', 'year,flag\n2021,caf\xe9\n'.encode('latin-1'))
+    second, = zip_processor.process(archive, tmp_path / 'out')
+    assert second.read_bytes() == '{"year":2021,"flag":"café"}\n'.encode()
+
+
+def test_loose_csv_files_detect_their_own_dialect(converter, tmp_path):
+    semicolon, comma = tmp_path / 'a.csv', tmp_path / 'b.csv'
+    semicolon.write_text('x;y\n1;2\n')
+    comma.write_text('x,y\n3,4\n')
+    
+    assert _convert(converter, semicolon, tmp_path / 'out') == b'{"x":1,"y":2}\n'
+    assert _convert(converter, comma, tmp_path / 'out') == b'{"x":3,"y":4}\n'
+
+
+def test_zip_member_without_pyarrow_is_converted_in_blocks(crawler, tmp_path, monkeypatch):
+    converter = _python_converter(crawler, monkeypatch, 1 << 10)
+    split_row_ranges = crawler.CSVToJSONConverter._split_row_ranges
+    block_counts = []
+    
+    def spy(self, csv_path, delimiter):
+        ranges = split_row_ranges(self, csv_path, delimiter)
+        block_counts.append(len(ranges) - 1)
+        return ranges
+    
+    monkeypatch.setattr(crawler.CSVToJSONConverter, '_split_row_ranges', spy)
+    csv_path = tmp_path / 'member.csv'
+    csv_path.write_text('id,text\n' + ''.join(f'{i},"row\n{i}"\n' for i in range(2000)))
+    archive = tmp_path / 'data.zip'
+    _zip_with(archive, 'member.csv', csv_path.read_bytes())
+    
+    json_path, = crawler.ZipProcessor(crawler.Config(), stream_processors=[converter]).process(archive, tmp_path / 'out')
+    
+    assert block_counts[0] > 1
+    assert json_path.read_bytes() == _reference_output(converter, csv_path)
+    assert [path.name for path in (tmp_path / 'out').iterdir()] == ['member.jsonl']
@@ -0,0 +1,67 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+
+
+def _ranged_app(payload, etag):
+    """Serve payload with Range support and the given ETag, honouring If-Range like a compliant server"""
+    requests = []
+    
+    async def handler(request):
+        requests.append(dict(request.headers))
+        headers = {'ETag': etag, 'Accept-Ranges': 'bytes'}
+        byte_range = request.headers.get('Range')
+        if_range = request.headers.get('If-Range')
+        
+        # Weak validators never match If-Range, so the full body is sent
+        if byte_range and (if_range is None or (if_range == etag and not etag.startswith('W/'))):
+            start, end = (int(bound) for bound in byte_range[len('bytes='):].split('-'))
+            headers['Content-Range'] = f"bytes {start}-{end}/{len(payload)}"
+            return web.Response(status=206, body=payload[start:end + 1], headers=headers)
+        return web.Response(body=payload, headers=headers)
+    
+    app = web.Application()
+    app.router.add_get('/file.zip', handler)
+    return app, requests
+
+
+async def _download(crawler, serve, tmp_path, etag, size_delta=0):
+    payload = bytes(range(256)) * (96 << 10)  # 24 MiB, enough for several ranges
+    app, requests = _ranged_app(payload, etag)
+    
+    async with serve(app) as base_url:
+        config = crawler.Config(cache_file=str(tmp_path / 'cache.json'))
+        downloader = crawler.FileDownloader(config, crawler.JsonFileCache(config))
+        downloader._validate_download = lambda path, info: True
+        file_info = crawler.FileInfo(
+            url=f"{base_url}/file.zip", filename='file.zip', size=len(payload) + size_delta, accept_ranges=True
+        )
+        destination = tmp_path / 'file.zip'
+        
+        async with aiohttp.ClientSession() as session:
+            assert await downloader.download(session, file_info, destination)
+    
+    assert destination.read_bytes() == payload
+    return requests
+
+
+def test_strong_etag_downloads_in_ranges(crawler, serve, tmp_path):
+    requests = asyncio.run(_download(crawler, serve, tmp_path, '"v1"'))
+    
+    assert len(requests) > 1
+    assert all(r.get('If-Range') == '"v1"' for r in requests[1:])
+
+
+def test_weak_etag_is_never_sent_in_if_range(crawler, serve, tmp_path):
+    requests = asyncio.run(_download(crawler, serve, tmp_path, 'W/"v1"'))
+    
+    assert not any('If-Range' in r for r in requests)
+    assert 'Range' not in requests[-1]
+
+
+def test_size_change_since_head_falls_back_to_single_stream(crawler, serve, tmp_path):
+    requests = asyncio.run(_download(crawler, serve, tmp_path, '"v1"', size_delta=-(1 << 20)))
+    
+    assert len(requests) == 2
+    assert 'Range' not in requests[-1]
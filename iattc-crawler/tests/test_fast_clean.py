@@ -0,0 +1,34 @@
+import pytest
+
+fast_clean = pytest.importorskip('fast_clean')
+
+EDGE_VALUES = [
+    '1.', '.5', '1e5', '1E-5', '+.5e+3', '1e', 'e5', '+', '-', '.', '+5', '-0', '007',
+    '123456789012345678', '-123456789012345678', '1234567890123456789', '9' * 25,
+    '٣', '１２', '3٣', '٣.5', ' 7 ', '\x1c7\x1f', ' 12 ',
+    'yes', 'No', 'TRUE', '1', '0', 'nan', 'inf', '0x10', '1_000', '', '   '
+]
+
+
+@pytest.mark.parametrize('value', EDGE_VALUES)
+def test_compiled_cleaner_matches_python(crawler, converter, monkeypatch, value):
+    header = ['value', 'other']
+    args = (converter._TRUE_SET, converter._BOOL_SET, converter._convert_value)
+    compiled = fast_clean.clean_row(header, [value, 'x'], *args)
+    
+    monkeypatch.setattr(crawler, 'fast_clean', None)
+    expected = converter._clean_row(header, [value, 'x'])
+    
+    assert compiled == expected
+    assert type(compiled['value']) is type(expected['value'])
+
+
+def test_compiled_cleaner_pads_and_truncates_like_python(crawler, converter, monkeypatch):
+    header = ['a', 'b', 'a']
+    args = (converter._TRUE_SET, converter._BOOL_SET, converter._convert_value)
+    rows = [['1'], ['1', '2', '', '4'], ['1', '', '3']]
+    compiled = [fast_clean.clean_row(header, values, *args) for values in rows]
+    
+    monkeypatch.setattr(crawler, 'fast_clean', None)
+    
+    assert compiled == [converter._clean_row(header, values) for values in rows]
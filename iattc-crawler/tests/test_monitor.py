@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import zipfile
+
+from aiohttp import web
+
+
+def _monitor(crawler, tmp_path, base_url='http://example.test/'):
+    config = crawler.Config(
+        base_url=base_url,
+        download_dir=str(tmp_path / 'downloads'),
+        output_dir=str(tmp_path / 'output'),
+        cache_file=str(tmp_path / 'cache.json')
+    )
+    return crawler.create_monitor(config)
+
+
+def _archive(path, corrupt=False):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as zf:
+        zf.writestr('good.csv', 'a,b\n1,2\n')
+        zf.writestr('bad.csv', 'a,b\n3,4\n')
+    
+    if corrupt:
+        # Flip a byte of the stored bad.csv data so its CRC check fails on read
+        data = bytearray(path.read_bytes())
+        offset = data.rindex(b'3,4')
+        data[offset] = ord('9')
+        path.write_bytes(bytes(data))
+
+
+def _file_info(crawler, name):
+    return crawler.FileInfo(url=f"http://example.test/{name}", filename=name, etag='"e1"', last_modified='Mon', size=1)
+
+
+def test_failed_member_is_not_marked_processed(crawler, tmp_path):
+    monitor = _monitor(crawler, tmp_path)
+    archive = tmp_path / 'downloads' / 'broken.zip'
+    _archive(archive, corrupt=True)
+    file_info = _file_info(crawler, 'broken.zip')
+    
+    monitor._process_files([(file_info, archive)])
+    
+    assert 'processed' not in monitor.cache.get_file_entry(file_info.url)
+    assert (tmp_path / 'output' / 'good.jsonl').exists()
+
+
+def test_converted_archive_is_marked_processed(crawler, tmp_path):
+    monitor = _monitor(crawler, tmp_path)
+    archive = tmp_path / 'downloads' / 'data.zip'
+    _archive(archive)
+    file_info = _file_info(crawler, 'data.zip')
+    
+    processed = monitor._process_files([(file_info, archive)])
+    
+    assert sorted(path.name for path in processed) == ['bad.jsonl', 'good.jsonl']
+    assert monitor.cache.get_file_entry(file_info.url)['processed'] == ['"e1"', 'Mon', 1]
+
+
+def test_failed_cycle_is_retried_while_the_page_is_unchanged(crawler, serve, tmp_path):
+    archive = tmp_path / 'data.zip'
+    _archive(archive)
+    payload = archive.read_bytes()
+    zip_headers = {'ETag': '"z1"', 'Last-Modified': 'Mon', 'Content-Length': str(len(payload))}
+    zip_responses = [web.Response(status=503), web.Response(body=payload, headers=zip_headers)]
+    page_statuses = []
+    
+    async def page(request):
+        if request.headers.get('If-None-Match') == '"p1"':
+            page_statuses.append(304)
+            return web.Response(status=304)
+        page_statuses.append(200)
+        return web.Response(text='<a href="data.zip">Data</a>', content_type='text/html', headers={'ETag': '"p1"'})
+    
+    async def data(request):
+        if request.method == 'HEAD':
+            return web.Response(headers=zip_headers)
+        return zip_responses.pop(0)
+    
+    app = web.Application()
+    app.router.add_get('/', page)
+    app.router.add_get('/data.zip', data)
+    
+    async def run_cycles():
+        async with serve(app) as base_url:
+            monitor = _monitor(crawler, tmp_path, f"{base_url}/")
+            await monitor._run_cycle()
+            assert monitor.cache.load().get('etag') is None
+            await monitor._run_cycle()
+            await monitor._run_cycle()
+            return monitor
+    
+    monitor = asyncio.run(run_cycles())
+    
+    assert (tmp_path / 'output' / 'good.jsonl').exists()
+    assert monitor.cache.load()['files'][f"{monitor.config.base_url}data.zip"]['processed'] == ['"z1"', 'Mon', len(payload)]
+    assert page_statuses[-1] == 304
+
+
+def test_processing_runs_off_the_event_loop_thread(crawler, tmp_path, monkeypatch):
+    monitor = _monitor(crawler, tmp_path)
+    file_info = _file_info(crawler, 'data.zip')
+    threads = []
+    
+    async def detect_changes(session, url):
+        return True
+    
+    async def get_zip_files(session, url):
+        return [file_info]
+    
+    async def download(session, info, destination):
+        return True
+    
+    monkeypatch.setattr(monitor.website_monitor, 'detect_changes', detect_changes)
+    monkeypatch.setattr(monitor.website_monitor, 'get_zip_files', get_zip_files)
+    monkeypatch.setattr(monitor.file_downloader, 'download', download)
+    monkeypatch.setattr(monitor, '_process_files', lambda downloaded, failed: threads.append(threading.get_ident()) or [])
+    
+    asyncio.run(monitor._run_cycle_with_session(None))
+    
+    assert threads and threads[0] != threading.get_ident()
@@ -0,0 +1,62 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+
+
+async def _discover_twice(crawler, serve, tmp_path, first_page, second_page, second_etag='"v1"'):
+    pages = [first_page, second_page]
+    etag = ['"v1"']
+    heads = []
+    
+    async def page(request):
+        return web.Response(text=pages.pop(0), content_type='text/html')
+    
+    async def archive(request):
+        heads.append(request.path)
+        return web.Response(headers={'Content-Length': '10', 'Last-Modified': 'Mon', 'ETag': etag[0]})
+    
+    app = web.Application()
+    app.router.add_get('/', page)
+    app.router.add_route('HEAD', '/{name}.zip', archive)
+    
+    async with serve(app) as base_url:
+        config = crawler.Config(cache_file=str(tmp_path / 'cache.json'))
+        monitor = crawler.WebsiteMonitor(config, crawler.JsonFileCache(config))
+        async with aiohttp.ClientSession() as session:
+            first = await monitor.get_zip_files(session, f"{base_url}/")
+            heads_after_first = len(heads)
+            etag[0] = second_etag
+            second = await monitor.get_zip_files(session, f"{base_url}/")
+    return first, second, heads_after_first, len(heads) - heads_after_first
+
+
+def test_same_page_version_reuses_metadata(crawler, serve, tmp_path):
+    page = '<a href="a.zip">A</a><a href="b.zip">B</a>'
+    _, second, first_heads, second_heads = asyncio.run(_discover_twice(crawler, serve, tmp_path, page, page))
+    
+    assert (first_heads, second_heads) == (2, 0)
+    assert [(f.filename, f.size, f.etag) for f in second] == [('a.zip', 10, '"v1"'), ('b.zip', 10, '"v1"')]
+
+
+def test_page_edit_rechecks_republished_zip(crawler, serve, tmp_path):
+    _, second, first_heads, second_heads = asyncio.run(_discover_twice(
+        crawler, serve, tmp_path,
+        '<p>Updated Monday</p><a href="a.zip">A</a>',
+        '<p>Updated Tuesday</p><a href="a.zip">A</a>',
+        second_etag='"v2"'
+    ))
+    
+    assert (first_heads, second_heads) == (1, 1)
+    assert [(f.filename, f.etag) for f in second] == [('a.zip', '"v2"')]
+
+
+def test_new_link_refreshes_metadata(crawler, serve, tmp_path):
+    _, second, _, second_heads = asyncio.run(_discover_twice(
+        crawler, serve, tmp_path,
+        '<a href="a.zip">A</a>',
+        '<a href="a.zip">A</a><a href="c.zip">C</a>'
+    ))
+    
+    assert second_heads == 2
+    assert all(f.size == 10 for f in second)